@@ -8,18 +8,25 @@ from typing import Optional
 
 import requests
 
+DROPBOX_API_URL = "https://api.dropboxapi.com"
+DROPBOX_CONTENT_URL = "https://content.dropboxapi.com"
+
 
 @dataclass(frozen=True)
 class DropboxConfig:
     access_token: str
     base_folder: str
     create_shared_link: bool
+    api_url: str = DROPBOX_API_URL
+    content_url: str = DROPBOX_CONTENT_URL
 
 
 def load_dropbox_config() -> Optional[DropboxConfig]:
     """Load Dropbox settings from environment.
 
     If DROPBOX_ACCESS_TOKEN is not set, Dropbox upload is disabled.
+    DROPBOX_API_URL / DROPBOX_CONTENT_URL override the endpoints (used to point
+    the pipeline at a local stand-in).
     """
     token = (os.environ.get("DROPBOX_ACCESS_TOKEN") or "").strip()
     if not token:
@@ -36,7 +43,16 @@ def load_dropbox_config() -> Optional[DropboxConfig]:
         "y",
     }
 
-    return DropboxConfig(access_token=token, base_folder=base_folder, create_shared_link=create_link)
+    api_url = (os.environ.get("DROPBOX_API_URL") or DROPBOX_API_URL).strip().rstrip("/")
+    content_url = (os.environ.get("DROPBOX_CONTENT_URL") or DROPBOX_CONTENT_URL).strip().rstrip("/")
+
+    return DropboxConfig(
+        access_token=token,
+        base_folder=base_folder,
+        create_shared_link=create_link,
+        api_url=api_url,
+        content_url=content_url,
+    )
 
 
 def _dropbox_api_headers(token: str) -> dict:
@@ -57,7 +73,7 @@ def upload_pdf_and_get_link(cfg: DropboxConfig, dropbox_path: str, pdf_bytes: by
 
     Returns a shared link URL if enabled, otherwise None.
     """
-    upload_url = "https://content.dropboxapi.com/2/files/upload"
+    upload_url = f"{cfg.content_url}/2/files/upload"
     upload_headers = {
         **_dropbox_api_headers(cfg.access_token),
         "Content-Type": "application/octet-stream",
@@ -73,17 +89,20 @@ def upload_pdf_and_get_link(cfg: DropboxConfig, dropbox_path: str, pdf_bytes: by
     r = requests.post(upload_url, headers=upload_headers, data=pdf_bytes, timeout=30)
     r.raise_for_status()
 
+    # autorename may have stored the file under a different name; link that one
+    dropbox_path = str((r.json() or {}).get("path_display") or dropbox_path)
+
     if not cfg.create_shared_link:
         return None
 
     # Try to create (or reuse) a shared link
-    link_url = "https://api.dropboxapi.com/2/sharing/create_shared_link_with_settings"
+    link_url = f"{cfg.api_url}/2/sharing/create_shared_link_with_settings"
     payload = {"path": dropbox_path, "settings": {"requested_visibility": "public"}}
     r2 = requests.post(link_url, headers={**_dropbox_api_headers(cfg.access_token), "Content-Type": "application/json"}, json=payload, timeout=30)
 
     if r2.status_code == 409:
         # Shared link already exists; fetch existing links
-        list_url = "https://api.dropboxapi.com/2/sharing/list_shared_links"
+        list_url = f"{cfg.api_url}/2/sharing/list_shared_links"
         r3 = requests.post(
             list_url,
             headers={**_dropbox_api_headers(cfg.access_token), "Content-Type": "application/json"},
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import base64
+import json
+import random
+import socketserver
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+
+# -----------------------
+# Fault injection
+# -----------------------
+@dataclass(frozen=True)
+class FaultConfig:
+    """
+    Latency (seconds) and error probabilities (0..1) for a fake service.
+    Only the rates relevant to the service are used.
+    """
+
+    latency: float = 0.0
+    smtp_421_rate: float = 0.0
+    smtp_451_rate: float = 0.0
+    http_429_rate: float = 0.0
+    http_409_rate: float = 0.0
+
+
+class _FaultState:
+    """Thread-safe RNG + counters shared by all handler threads of one server."""
+
+    def __init__(self, faults: FaultConfig, seed: Optional[int]):
+        self.faults = faults
+        self.counts: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def roll(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self._lock:
+            return self._rng.random() < rate
+
+    def count(self, key: str) -> None:
+        with self._lock:
+            self.counts[key] += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+    def delay(self) -> None:
+        if self.faults.latency > 0:
+            time.sleep(self.faults.latency)
+
+
+# -----------------------
+# Fake SMTP server
+# -----------------------
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """
+    Minimal SMTP dialogue: enough for smtplib's EHLO/AUTH PLAIN/MAIL/RCPT/DATA/QUIT.
+    No STARTTLS — the client must run with SMTP_STARTTLS=false.
+    """
+
+    def _reply(self, line: str) -> None:
+        self.wfile.write((line + "\r\n").encode("utf-8"))
+        self.wfile.flush()
+
+    def _readline(self) -> Optional[str]:
+        raw = self.rfile.readline()
+        if not raw:
+            return None
+        return raw.decode("utf-8", "replace").rstrip("\r\n")
+
+    def handle(self) -> None:
+        state: _FaultState = self.server.state  # type: ignore[attr-defined]
+        self._reply("220 fake-smtp ready")
+
+        while True:
+            line = self._readline()
+            if line is None:
+                return
+
+            verb, _, arg = line.partition(" ")
+            verb = verb.upper()
+
+            if verb in ("EHLO", "HELO"):
+                self.wfile.write(b"250-fake-smtp\r\n250-AUTH PLAIN\r\n250-8BITMIME\r\n250-SMTPUTF8\r\n250 SIZE 52428800\r\n")
+                self.wfile.flush()
+            elif verb == "AUTH":
+                if not arg.upper().startswith("PLAIN"):
+                    self._reply("504 5.5.4 Unrecognized authentication type")
+                    continue
+                if len(arg.split()) == 1:
+                    # No initial response: ask for credentials
+                    self._reply("334 ")
+                    if self._readline() is None:
+                        return
+                self._reply("235 2.7.0 Authentication successful")
+            elif verb == "MAIL":
+                if state.roll(state.faults.smtp_421_rate):
+                    state.count("smtp_421")
+                    self._reply("421 4.7.0 Too many connections, try again later")
+                    return
+                if state.roll(state.faults.smtp_451_rate):
+                    state.count("smtp_451")
+                    self._reply("451 4.7.1 Rate limited, try again later")
+                    continue
+                self._reply("250 2.1.0 OK")
+            elif verb == "RCPT":
+                self._reply("250 2.1.5 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                while True:
+                    data_line = self._readline()
+                    if data_line is None:
+                        return
+                    if data_line == ".":
+                        break
+                state.delay()
+                state.count("smtp_accepted")
+                self._reply("250 2.0.0 Queued")
+            elif verb in ("RSET", "NOOP"):
+                self._reply("250 2.0.0 OK")
+            elif verb == "QUIT":
+                self._reply("221 2.0.0 Bye")
+                return
+            else:
+                self._reply("502 5.5.2 Command not implemented")
+
+
+class FakeSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, faults: FaultConfig = FaultConfig(), seed: Optional[int] = None):
+        super().__init__((host, port), _SMTPHandler)
+        self.state = _FaultState(faults, seed)
+
+
+# -----------------------
+# Fake Dropbox HTTP API
+# -----------------------
+class _DropboxHandler(BaseHTTPRequestHandler):
+    """
+    Serves the three endpoints used by app.dropbox_uploader. Content and API
+    hosts are both served from the same base URL.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002
+        pass
+
+    def _send_json(self, status: int, payload: dict, headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        server: FakeDropboxServer = self.server  # type: ignore[assignment]
+        state = server.state
+
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        if not (self.headers.get("Authorization") or "").startswith("Bearer "):
+            self._send_json(401, {"error_summary": "invalid_access_token/"})
+            return
+
+        state.delay()
+
+        if state.roll(state.faults.http_429_rate):
+            state.count("http_429")
+            self._send_json(429, {"error_summary": "too_many_requests/"}, headers={"Retry-After": "1"})
+            return
+
+        if self.path == "/2/files/upload":
+            arg = json.loads(self.headers.get("Dropbox-API-Arg") or "{}")
+            path = server.store_file(str(arg.get("path") or ""), len(body))
+            state.count("upload")
+            self._send_json(200, {"path_display": path, "size": len(body)})
+        elif self.path == "/2/sharing/create_shared_link_with_settings":
+            path = str((json.loads(body or b"{}") or {}).get("path") or "")
+            url, existed = server.get_or_create_link(path)
+            if existed or state.roll(state.faults.http_409_rate):
+                state.count("http_409")
+                self._send_json(409, {"error_summary": "shared_link_already_exists/"})
+                return
+            state.count("link_created")
+            self._send_json(200, {"url": url, "path_lower": path.lower()})
+        elif self.path == "/2/sharing/list_shared_links":
+            path = str((json.loads(body or b"{}") or {}).get("path") or "")
+            url, _ = server.get_or_create_link(path)
+            state.count("link_listed")
+            self._send_json(200, {"links": [{"url": url, "path_lower": path.lower()}], "has_more": False})
+        else:
+            self._send_json(404, {"error_summary": "not_found/"})
+
+
+class FakeDropboxServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, faults: FaultConfig = FaultConfig(), seed: Optional[int] = None):
+        super().__init__((host, port), _DropboxHandler)
+        self.state = _FaultState(faults, seed)
+        self._files: Dict[str, int] = {}
+        self._links: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def store_file(self, path: str, size: int) -> str:
+        """Mimics mode=add + autorename: never overwrites, appends ' (n)' instead."""
+        with self._lock:
+            final = path
+            n = 1
+            while final in self._files:
+                stem, dot, ext = path.rpartition(".")
+                final = f"{stem} ({n}).{ext}" if dot else f"{path} ({n})"
+                n += 1
+            self._files[final] = size
+            return final
+
+    def get_or_create_link(self, path: str) -> tuple[str, bool]:
+        """Returns (url, already_existed) for a path's shared link."""
+        with self._lock:
+            if path in self._links:
+                return self._links[path], True
+            token = base64.urlsafe_b64encode(path.encode("utf-8")).decode("ascii").rstrip("=")
+            url = f"{self.base_url}/s/{token}"
+            self._links[path] = url
+            return url, False
+
+
+# -----------------------
+# Lifecycle helpers
+# -----------------------
+def start_in_thread(server: socketserver.BaseServer) -> threading.Thread:
+    t = threading.Thread(target=server.serve_forever, name=type(server).__name__, daemon=True)
+    t.start()
+    return t
+
+
+def stop(server: socketserver.BaseServer) -> None:
+    server.shutdown()
+    server.server_close()
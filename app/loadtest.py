@@ -0,0 +1,300 @@
+"""
+End-to-end load-test / replay harness.
+
+Replays recorded repository_dispatch event files through the full pipeline
+(load_event -> parse_submission -> render -> send_mail -> Dropbox upload)
+against a local fake SMTP server and fake Dropbox API. Nothing leaves the
+machine, so a real day's events can be replayed safely.
+
+Example:
+    python -m app.loadtest sample_event.json --repeat 200 --rate 20 --concurrency 8 \
+        --smtp-451-rate 0.05 --dropbox-429-rate 0.02 --dropbox-409-rate 0.1
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import smtplib
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import requests
+
+from app.dropbox_uploader import build_dropbox_path, load_dropbox_config, upload_pdf_and_get_link
+from app.fake_services import FakeDropboxServer, FakeSMTPServer, FaultConfig, start_in_thread, stop
+from app.main import process_event
+from app.payload import load_event
+
+# Error classes the fakes can inject; anything else failing an event is a bug
+INJECTED_ERRORS = {"smtp_421", "smtp_451", "http_429"}
+
+@dataclass
+class LoadTestResult:
+    events: int = 0
+    ok: int = 0
+    wall_seconds: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+    errors: Counter = field(default_factory=Counter)
+    smtp_server: Dict[str, int] = field(default_factory=dict)
+    dropbox_server: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "events": self.events,
+            "ok": self.ok,
+            "failed": self.events - self.ok,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "throughput_per_s": round(self.events / self.wall_seconds, 2) if self.wall_seconds else 0.0,
+            "latency_ms": {
+                name: round(_percentile(self.latencies, pct) * 1000, 1)
+                for name, pct in (("p50", 50), ("p90", 90), ("p95", 95), ("p99", 99), ("max", 100))
+            },
+            "errors": dict(self.errors),
+            "smtp_server": self.smtp_server,
+            "dropbox_server": self.dropbox_server,
+        }
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))  # ceil without floats
+    return ordered[int(rank) - 1]
+
+
+def _classify_error(exc: BaseException) -> str:
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return f"smtp_{exc.smtp_code}"
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        return f"http_{exc.response.status_code}"
+    return type(exc).__name__
+
+
+def expand_event_paths(inputs: List[str]) -> List[str]:
+    """Accepts files, directories (all *.json inside) and glob patterns."""
+    paths: List[str] = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(sorted(glob.glob(os.path.join(item, "*.json"))))
+        elif any(ch in item for ch in "*?["):
+            paths.extend(sorted(glob.glob(item)))
+        elif os.path.isfile(item):
+            paths.append(item)
+        else:
+            raise ValueError(f"Event file does not exist: {item}")
+    if not paths:
+        raise ValueError("No event files found.")
+    return paths
+
+
+def _run_pipeline(path: str) -> None:
+    """
+    One replayed event: the production path (load -> parse -> render -> mail)
+    followed by the Dropbox archive step, which main() does not run.
+    """
+    submission, pdf_bytes = process_event(load_event(path))
+    dropbox_cfg = load_dropbox_config()
+    if dropbox_cfg is not None:
+        dropbox_path = build_dropbox_path(dropbox_cfg.base_folder, submission.submission_id)
+        upload_pdf_and_get_link(dropbox_cfg, dropbox_path, pdf_bytes)
+
+
+def _point_pipeline_at(smtp: FakeSMTPServer, dropbox: FakeDropboxServer) -> None:
+    """Routes the pipeline's env-based config to the local stand-ins."""
+    host, port = smtp.server_address[:2]
+    os.environ.update(
+        {
+            "SMTP_HOST": str(host),
+            "SMTP_PORT": str(port),
+            "SMTP_USER": "loadtest",
+            "SMTP_PASS": "loadtest",
+            "SMTP_STARTTLS": "false",
+            "MAIL_FROM": "loadtest@localhost",
+            "DROPBOX_ACCESS_TOKEN": "loadtest",
+            "DROPBOX_API_URL": dropbox.base_url,
+            "DROPBOX_CONTENT_URL": dropbox.base_url,
+            "DROPBOX_CREATE_SHARED_LINK": "true",
+        }
+    )
+
+
+def run_load_test(
+    event_paths: List[str],
+    *,
+    repeat: int = 1,
+    rate: float = 0.0,
+    concurrency: int = 4,
+    smtp_faults: FaultConfig = FaultConfig(),
+    dropbox_faults: FaultConfig = FaultConfig(),
+    seed: Optional[int] = None,
+) -> LoadTestResult:
+    """
+    Replays event_paths `repeat` times. rate > 0 schedules events open-loop at
+    that many per second, and latency is measured from each event's scheduled
+    start so queueing delay under saturation shows up in the percentiles.
+    rate == 0 runs closed-loop as fast as `concurrency` allows, and latency is
+    measured from when a worker actually picks the event up.
+
+    Workers are threads, so concurrency overlaps the SMTP and Dropbox I/O.
+    PDF rendering is serialized by the renderers' own lock (ReportLab's shared
+    font state is not thread-safe), matching production's one event per process.
+    """
+    # Separate seeds so SMTP and Dropbox fault rolls are independent
+    smtp = FakeSMTPServer(faults=smtp_faults, seed=seed)
+    dropbox = FakeDropboxServer(faults=dropbox_faults, seed=None if seed is None else seed + 1)
+    start_in_thread(smtp)
+    start_in_thread(dropbox)
+
+    saved_env = dict(os.environ)
+    _point_pipeline_at(smtp, dropbox)
+
+    result = LoadTestResult()
+    lock = threading.Lock()
+    schedule = [p for _ in range(repeat) for p in event_paths]
+
+    def run_one(path: str, scheduled: Optional[float]) -> None:
+        if scheduled is None:
+            started = time.perf_counter()
+        else:
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            started = scheduled
+        error: Optional[str] = None
+        try:
+            _run_pipeline(path)
+        except Exception as exc:  # noqa: BLE001 - every failure is a data point
+            error = _classify_error(exc)
+        elapsed = time.perf_counter() - started
+        with lock:
+            result.events += 1
+            result.latencies.append(elapsed)
+            if error is None:
+                result.ok += 1
+            else:
+                result.errors[error] += 1
+
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            for i, path in enumerate(schedule):
+                scheduled = start + i / rate if rate > 0 else None
+                pool.submit(run_one, path, scheduled)
+        result.wall_seconds = time.perf_counter() - start
+    finally:
+        os.environ.clear()
+        os.environ.update(saved_env)
+        result.smtp_server = smtp.state.snapshot()
+        result.dropbox_server = dropbox.state.snapshot()
+        stop(smtp)
+        stop(dropbox)
+
+    return result
+
+
+def check_consistency(result: LoadTestResult) -> List[str]:
+    """
+    Cross-checks the harness's own counts against what the fake servers saw.
+    Returns a list of mismatches; empty means the books balance. Assumes
+    shared links are enabled and no retries (every injected fault fails its event).
+    """
+    problems: List[str] = []
+    errors = result.errors
+    smtp = result.smtp_server
+    dropbox = result.dropbox_server
+
+    def expect(name: str, got: int, want: int) -> None:
+        if got != want:
+            problems.append(f"{name}: got {got}, expected {want}")
+
+    for name, n in sorted(errors.items()):
+        if name not in INJECTED_ERRORS:
+            problems.append(f"unexpected error {name}: {n} event(s) failed with an error the harness did not inject")
+
+    expect("ok + errors == events", result.ok + sum(errors.values()), result.events)
+    expect("latency samples == events", len(result.latencies), result.events)
+    for code in ("smtp_421", "smtp_451"):
+        expect(f"{code} client == server", errors.get(code, 0), smtp.get(code, 0))
+    expect("http_429 client == server", errors.get("http_429", 0), dropbox.get("http_429", 0))
+
+    dropbox_failures = sum(n for k, n in errors.items() if k.startswith("http_"))
+    expect("mails accepted == ok + Dropbox failures", smtp.get("smtp_accepted", 0), result.ok + dropbox_failures)
+    expect("links returned == ok", dropbox.get("link_created", 0) + dropbox.get("link_listed", 0), result.ok)
+    return problems
+
+
+def _format_report(report: Dict[str, object]) -> str:
+    lat = report["latency_ms"]
+    lines = [
+        f"events: {report['events']}  ok: {report['ok']}  failed: {report['failed']}",
+        f"wall: {report['wall_seconds']}s  throughput: {report['throughput_per_s']}/s",
+        "latency ms: " + "  ".join(f"{k}={v}" for k, v in lat.items()),  # type: ignore[union-attr]
+        f"errors: {report['errors'] or '-'}",
+        f"fake smtp: {report['smtp_server'] or '-'}",
+        f"fake dropbox: {report['dropbox_server'] or '-'}",
+    ]
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="Replay recorded events through the pipeline against local fakes.")
+    ap.add_argument("events", nargs="+", help="Event JSON files, directories or glob patterns")
+    ap.add_argument("--repeat", type=int, default=1, help="Replay the event list N times")
+    ap.add_argument("--rate", type=float, default=0.0, help="Target events/second (0 = as fast as possible)")
+    ap.add_argument("--concurrency", type=int, default=4, help="Worker threads")
+    ap.add_argument("--seed", type=int, default=None, help="RNG seed for error injection")
+    ap.add_argument("--smtp-latency", type=float, default=0.0, help="Seconds added per accepted message")
+    ap.add_argument("--smtp-421-rate", type=float, default=0.0, help="Probability of 421 + disconnect on MAIL FROM")
+    ap.add_argument("--smtp-451-rate", type=float, default=0.0, help="Probability of 451 throttle on MAIL FROM")
+    ap.add_argument("--dropbox-latency", type=float, default=0.0, help="Seconds added per Dropbox API call")
+    ap.add_argument("--dropbox-429-rate", type=float, default=0.0, help="Probability of 429 per Dropbox API call")
+    ap.add_argument("--dropbox-409-rate", type=float, default=0.0, help="Probability of 409 on shared-link creation")
+    ap.add_argument("--json", action="store_true", help="Print the report as JSON")
+    ap.add_argument("--check", action="store_true", help="Verify the counts balance; exit 1 if not")
+    args = ap.parse_args(argv)
+
+    try:
+        event_paths = expand_event_paths(args.events)
+    except ValueError as exc:
+        ap.error(str(exc))
+
+    result = run_load_test(
+        event_paths,
+        repeat=args.repeat,
+        rate=args.rate,
+        concurrency=args.concurrency,
+        smtp_faults=FaultConfig(
+            latency=args.smtp_latency,
+            smtp_421_rate=args.smtp_421_rate,
+            smtp_451_rate=args.smtp_451_rate,
+        ),
+        dropbox_faults=FaultConfig(
+            latency=args.dropbox_latency,
+            http_429_rate=args.dropbox_429_rate,
+            http_409_rate=args.dropbox_409_rate,
+        ),
+        seed=args.seed,
+    )
+
+    report = result.to_dict()
+    print(json.dumps(report, indent=2) if args.json else _format_report(report))
+
+    if args.check:
+        problems = check_consistency(result)
+        for p in problems:
+            print(f"check FAILED: {p}")
+        if problems:
+            raise SystemExit(1)
+        print("check: OK")
+
+
+if __name__ == "__main__":
+    main()
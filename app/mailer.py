@@ -19,6 +19,8 @@ def send_mail(
     smtp_user = os.environ.get("SMTP_USER")
     smtp_password = os.environ.get("SMTP_PASS")
     mail_from = os.environ.get("MAIL_FROM", smtp_user)
+    # Only disabled for local stand-ins (e.g. the load-test fake SMTP server)
+    use_starttls = os.environ.get("SMTP_STARTTLS", "true").strip().lower() in {"1", "true", "yes", "y"}
 
     if not smtp_user or not smtp_password:
         raise RuntimeError("SMTP_USER or SMTP_PASSWORD not set.")
@@ -37,6 +39,7 @@ def send_mail(
     )
 
     with smtplib.SMTP(smtp_host, smtp_port) as server:
-        server.starttls()
+        if use_starttls:
+            server.starttls()
         server.login(smtp_user, smtp_password)
         server.send_message(msg)
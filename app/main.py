@@ -1,13 +1,17 @@
 import os
+from typing import Any, Dict, Tuple
 
-from app.payload import load_event, parse_submission
+from app.payload import Submission, load_event, parse_submission
 from app.pdf_report import build_pdf_bytes, build_pdf_bytes_dynamic
 from app.mailer import send_mail
 
 
-def main():
-    # Load GitHub repository_dispatch event
-    event = load_event()
+def process_event(event: Dict[str, Any]) -> Tuple[Submission, bytes]:
+    """
+    Runs one repository_dispatch event through the pipeline:
+    parse -> render PDF -> send email.
+    Returns the parsed submission and the PDF that was sent.
+    """
     submission = parse_submission(event)
 
     # Mail content
@@ -55,6 +59,14 @@ def main():
         attachment_name=filename,
     )
 
+    return submission, pdf_bytes
+
+
+def main():
+    # Load GitHub repository_dispatch event
+    event = load_event()
+    process_event(event)
+
 
 if __name__ == "__main__":
     main()
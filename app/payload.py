@@ -25,14 +25,19 @@ class Submission:
     sections: List[Dict[str, Any]] = field(default_factory=list)
 
 
-def load_event() -> Dict[str, Any]:
+def load_event(path: Optional[str] = None) -> Dict[str, Any]:
     """
     Loads the GitHub Actions event payload from GITHUB_EVENT_PATH.
-    Works for repository_dispatch.
+    Works for repository_dispatch. An explicit path (e.g. a recorded event
+    replayed by the load-test harness) takes precedence over the env var.
     """
-    path = os.environ.get("GITHUB_EVENT_PATH", "")
-    if not path or not os.path.exists(path):
-        raise RuntimeError("GITHUB_EVENT_PATH is missing or file does not exist.")
+    if path:
+        if not os.path.exists(path):
+            raise RuntimeError(f"Event file does not exist: {path}")
+    else:
+        path = os.environ.get("GITHUB_EVENT_PATH", "")
+        if not path or not os.path.exists(path):
+            raise RuntimeError(f"GITHUB_EVENT_PATH is missing or file does not exist: {path!r}")
 
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
@@ -1,15 +1,22 @@
 from __future__ import annotations
 
+import hashlib
+import logging
 import os
+import threading
 from io import BytesIO
-from typing import Any, Dict, List
+from functools import lru_cache, wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
 from reportlab.lib import colors
 from reportlab.pdfgen import canvas
+from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfbase.ttfonts import TTFont
 
+logger = logging.getLogger(__name__)
 
 # -----------------------
 # Branding / footer text
@@ -19,9 +26,103 @@ LOGO_PATH = os.path.join(BASE_DIR, "logo.png")  # repo root/logo.png
 DOC_VERSION = os.environ.get("DOC_VERSION", "ReDent Nova GmbH • Customer Complaint Form")
 
 
+# -----------------------
+# Fonts
+# -----------------------
+# The built-in Helvetica only covers Latin-1. Point PDF_FONT_PATH (and optionally
+# PDF_FONT_BOLD_PATH) at a TrueType font such as DejaVuSans.ttf to render
+# Polish/Czech/Turkish names and addresses correctly.
+FONT_PATH = (os.environ.get("PDF_FONT_PATH") or "").strip()
+FONT_BOLD_PATH = (os.environ.get("PDF_FONT_BOLD_PATH") or "").strip()
+FALLBACK_FONT = "Helvetica"
+FALLBACK_FONT_BOLD = "Helvetica-Bold"
+
+# Registration is single-flight: the lock makes concurrent first calls parse
+# each font file once instead of racing past an empty cache.
+_FONT_LOCK = threading.Lock()
+_registered_fonts: Dict[str, Optional[str]] = {}
+
+# Registered TTFont objects are shared by every canvas in the process, and
+# ReportLab's per-document subset bookkeeping on them is not thread-safe.
+# Renderers hold this lock for the whole document.
+_RENDER_LOCK = threading.Lock()
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+def _register_ttf(path: str) -> Optional[str]:
+    """
+    Parses a TrueType file and registers it with ReportLab, once per process.
+    ReportLab embeds only the glyphs a document actually uses (font subsetting),
+    so the PDF size stays proportional to the text, not the font file.
+
+    The font is cosmetic, so a missing or unreadable file only logs a warning
+    and returns None instead of failing the whole run.
+    """
+    if path in _registered_fonts:
+        return _registered_fonts[path]
+
+    with _FONT_LOCK:
+        if path in _registered_fonts:
+            return _registered_fonts[path]
+
+        name: Optional[str]
+        try:
+            # Name derived from the full path: same basename in two folders must not collide
+            digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:10]
+            name = f"ReDent-{os.path.splitext(os.path.basename(path))[0]}-{digest}"
+            pdfmetrics.registerFont(TTFont(name, path))
+        except Exception as exc:
+            logger.warning("Could not load PDF font %s (%s); falling back to Helvetica.", path, exc)
+            name = None
+
+        _registered_fonts[path] = name
+        return name
+
+
+@lru_cache(maxsize=None)
+def _fonts() -> Tuple[str, str]:
+    """
+    Returns (regular, bold) font names used for both measuring and drawing.
+    Falls back to Helvetica when no TrueType font is configured or it fails to
+    load; an unset or broken bold path reuses the regular TrueType font so
+    glyph coverage stays consistent.
+    """
+    regular = _register_ttf(FONT_PATH) if FONT_PATH else None
+    if regular is None:
+        return FALLBACK_FONT, FALLBACK_FONT_BOLD
+
+    bold = _register_ttf(FONT_BOLD_PATH) if FONT_BOLD_PATH else None
+    return regular, bold or regular
+
+
+def _serialized(fn: _F) -> _F:
+    """Runs a renderer under _RENDER_LOCK (see above)."""
+
+    @wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with _RENDER_LOCK:
+            return fn(*args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
 # -----------------------
 # Text helpers
 # -----------------------
+@lru_cache(maxsize=None)
+def _char_width(ch: str, font_name: str) -> float:
+    """
+    Width of a single character at 1pt. Cached per process, so each glyph width
+    is looked up once instead of on every wrap trial.
+    """
+    return stringWidth(ch, font_name, 1)
+
+
+def _text_width(text: str, font_name: str, font_size: float) -> float:
+    return sum(_char_width(ch, font_name) for ch in text) * font_size
+
+
 def _wrap_text(text: str, max_width: float, font_name: str, font_size: int) -> List[str]:
     """
     Basic word-wrapping using ReportLab font metrics.
@@ -33,6 +134,8 @@ def _wrap_text(text: str, max_width: float, font_name: str, font_size: int) -> L
     s = str(text).replace("\r\n", "\n").replace("\r", "\n")
     paragraphs = s.split("\n")
 
+    space_w = _text_width(" ", font_name, font_size)
+
     lines: List[str] = []
     for p in paragraphs:
         p = p.strip()
@@ -42,30 +145,35 @@ def _wrap_text(text: str, max_width: float, font_name: str, font_size: int) -> L
 
         words = p.split()
         cur = ""
+        cur_w = 0.0
         for w in words:
-            trial = (cur + " " + w).strip()
-            if stringWidth(trial, font_name, font_size) <= max_width:
-                cur = trial
+            w_w = _text_width(w, font_name, font_size)
+            trial_w = (cur_w + space_w + w_w) if cur else w_w
+            if trial_w <= max_width:
+                cur = (cur + " " + w) if cur else w
+                cur_w = trial_w
             else:
                 if cur:
                     lines.append(cur)
                 # If a single word is too long, hard-split it
-                if stringWidth(w, font_name, font_size) > max_width:
+                if w_w > max_width:
                     chunk = ""
+                    chunk_w = 0.0
                     for ch in w:
-                        trial2 = chunk + ch
-                        if stringWidth(trial2, font_name, font_size) <= max_width:
-                            chunk = trial2
+                        ch_w = _char_width(ch, font_name) * font_size
+                        if chunk_w + ch_w <= max_width:
+                            chunk += ch
+                            chunk_w += ch_w
                         else:
                             if chunk:
                                 lines.append(chunk)
                             chunk = ch
-                    if chunk:
-                        cur = chunk
-                    else:
-                        cur = ""
+                            chunk_w = ch_w
+                    cur = chunk
+                    cur_w = chunk_w
                 else:
                     cur = w
+                    cur_w = w_w
         if cur:
             lines.append(cur)
 
@@ -75,11 +183,14 @@ def _wrap_text(text: str, max_width: float, font_name: str, font_size: int) -> L
 # ==========================================================
 # Legacy renderer (schema/fields-based) — keep for fallback
 # ==========================================================
+@_serialized
 def build_pdf_bytes(*, title: str, fields: Dict[str, Any]) -> bytes:
     """
     Minimal legacy PDF (kept so old payloads still work).
     If you don’t use old payloads anymore, it still won’t break anything.
     """
+    font_regular, font_bold = _fonts()
+
     buf = BytesIO()
     c = canvas.Canvas(buf, pagesize=A4)
     page_width, page_height = A4
@@ -96,26 +207,26 @@ def build_pdf_bytes(*, title: str, fields: Dict[str, Any]) -> bytes:
         y -= (logo_h + 8 * mm)
 
     # Title
-    c.setFont("Helvetica-Bold", 14)
+    c.setFont(font_bold, 14)
     c.drawString(margin_x, y, title)
     y -= 10 * mm
 
     # Dump a few key fields (simple)
-    c.setFont("Helvetica", 10)
+    c.setFont(font_regular, 10)
     for k in ["submission_id", "timestamp"]:
         v = fields.get(k, "")
         c.drawString(margin_x, y, f"{k}: {v}")
         y -= 6 * mm
 
     y -= 4 * mm
-    c.setFont("Helvetica", 9)
+    c.setFont(font_regular, 9)
 
     # Print remaining fields
     for k, v in fields.items():
         if k in ("submission_id", "timestamp"):
             continue
         line = f"{k}: {v}"
-        wrapped = _wrap_text(line, page_width - 2 * margin_x, "Helvetica", 9)
+        wrapped = _wrap_text(line, page_width - 2 * margin_x, font_regular, 9)
         for ln in wrapped:
             if y < 20 * mm:
                 c.showPage()
@@ -124,7 +235,7 @@ def build_pdf_bytes(*, title: str, fields: Dict[str, Any]) -> bytes:
             y -= 5 * mm
 
     # Footer
-    c.setFont("Helvetica", 8)
+    c.setFont(font_regular, 8)
     c.drawString(margin_x, 12 * mm, DOC_VERSION)
 
     c.save()
@@ -134,6 +245,7 @@ def build_pdf_bytes(*, title: str, fields: Dict[str, Any]) -> bytes:
 # ==========================================================
 # Dynamic renderer (sections/rows-based) — professional layout
 # ==========================================================
+@_serialized
 def build_pdf_bytes_dynamic(
     *,
     title: str,
@@ -147,6 +259,8 @@ def build_pdf_bytes_dynamic(
     Dynamic, form-driven PDF (boxed two-column layout).
     """
 
+    font_regular, font_bold = _fonts()
+
     buf = BytesIO()
     c = canvas.Canvas(buf, pagesize=A4)
     page_width, page_height = A4
@@ -164,8 +278,8 @@ def build_pdf_bytes_dynamic(
     # Typography
     title_size = 15
     section_size = 11
-    label_font = "Helvetica-Bold"
-    value_font = "Helvetica"
+    label_font = font_bold
+    value_font = font_regular
     label_size = 9
     value_size = 9
 
@@ -173,7 +287,7 @@ def build_pdf_bytes_dynamic(
     y = top_y
 
     def draw_footer() -> None:
-        c.setFont("Helvetica", 8)
+        c.setFont(font_regular, 8)
         c.drawString(margin_x, 12 * mm, DOC_VERSION)
         c.drawRightString(page_width - margin_x, 12 * mm, f"Page {page_num}")
 
@@ -203,7 +317,7 @@ def build_pdf_bytes_dynamic(
             y -= (logo_h + 6 * mm)
 
         # Title
-        c.setFont("Helvetica-Bold", title_size)
+        c.setFont(font_bold, title_size)
         c.drawCentredString(page_width / 2, y, title)
         y -= 9 * mm
 
@@ -220,7 +334,7 @@ def build_pdf_bytes_dynamic(
         right_x = box_x + box_w / 2 + 6
         txt_y = box_y + box_h - 8
 
-        c.setFont("Helvetica", 10)
+        c.setFont(font_regular, 10)
         c.drawString(left_x, txt_y, f"Complaint ID: {complaint_id}")
         c.drawString(right_x, txt_y, f"Status: {status}")
 
@@ -245,7 +359,7 @@ def build_pdf_bytes_dynamic(
             return
 
         ensure_space(12 * mm)
-        c.setFont("Helvetica-Bold", section_size)
+        c.setFont(font_bold, section_size)
         c.drawString(margin_x, y, section_title)
         y -= 7 * mm
 